@@ -1,84 +1,241 @@
 import asyncio
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+import os
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Any, Tuple
 
 import click
 import httpx
+import orjson
 import mcp.types as types
 from mcp.server.fastmcp import FastMCP
 from mcp.shared.exceptions import McpError
 
+try:
+    import uvloop
+except ImportError:  # Optional speedup; not available on Windows
+    uvloop = None
+
 KRAKEN_API_BASE = "https://api.kraken.com/0/public/"
 
+# Ticker endpoint, relative to KRAKEN_API_BASE; parsed once rather than per request
+_TICKER_URL = httpx.URL("Ticker")
 
-from datetime import datetime
 
-@dataclass
-class KrakenTickerData:
-    pair: str
-    ask: Dict[str, str]
-    bid: Dict[str, str]
-    last_trade: Dict[str, str]
-    volume: Dict[str, str]
-    volume_weighted_avg_price: Dict[str, str]
-    number_of_trades: Dict[str, str]
-    low: Dict[str, str]
-    high: Dict[str, str]
-    opening_price: str
-    timestamp: datetime = None
-    source: str = "Kraken API"
 
-    def to_text(self) -> str:
-        timestamp_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC") if self.timestamp else "Unknown time"
-        return f"""
-Kraken Ticker Information for {self.pair}
+def _env_seconds(name: str, default: float) -> float:
+    """Read a non-negative number of seconds from the environment, falling back to the default."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = float("nan")
+    if not seconds >= 0:
+        print(f"Ignoring invalid {name}={value!r}; using {default}", file=sys.stderr)
+        return default
+    return seconds
+
+
+# How long (in seconds) a fetched ticker is served from cache before refetching
+KRAKEN_CACHE_TTL = _env_seconds("KRAKEN_CACHE_TTL", 3.0)
 
-Data retrieved from {self.source} at {timestamp_str}
+# Oldest (in seconds) a cached ticker may be when served in place of a failed refresh
+KRAKEN_CACHE_MAX_STALE = _env_seconds("KRAKEN_CACHE_MAX_STALE", 60.0)
+
+
+_TICKER_TEMPLATE = """
+Kraken Ticker Information for {pair}
+
+Data retrieved from {source} at {timestamp}
 
 Current Prices:
-- Ask: {self.ask['price']} ({self.ask['whole_lot_volume']} volume, {self.ask['lot_volume']} lot volume)
-- Bid: {self.bid['price']} ({self.bid['whole_lot_volume']} volume, {self.bid['lot_volume']} lot volume)
-- Last Trade: {self.last_trade['price']} ({self.last_trade['volume']} volume)
+- Ask: {ask_price} ({ask_whole_lot_volume} volume, {ask_lot_volume} lot volume)
+- Bid: {bid_price} ({bid_whole_lot_volume} volume, {bid_lot_volume} lot volume)
+- Last Trade: {last_trade_price} ({last_trade_volume} volume)
 
 Volume Statistics:
-- Volume Today: {self.volume['today']}
-- Volume Last 24h: {self.volume['last_24h']}
-- Volume Weighted Avg Price Today: {self.volume_weighted_avg_price['today']}
-- Volume Weighted Avg Price Last 24h: {self.volume_weighted_avg_price['last_24h']}
+- Volume Today: {volume_today}
+- Volume Last 24h: {volume_last_24h}
+- Volume Weighted Avg Price Today: {volume_weighted_avg_price_today}
+- Volume Weighted Avg Price Last 24h: {volume_weighted_avg_price_last_24h}
 
 Trading Activity:
-- Number of Trades Today: {self.number_of_trades['today']}
-- Number of Trades Last 24h: {self.number_of_trades['last_24h']}
+- Number of Trades Today: {number_of_trades_today}
+- Number of Trades Last 24h: {number_of_trades_last_24h}
 
 Price Range:
-- Low Today: {self.low['today']}
-- Low Last 24h: {self.low['last_24h']}
-- High Today: {self.high['today']}
-- High Last 24h: {self.high['last_24h']}
-- Opening Price: {self.opening_price}
+- Low Today: {low_today}
+- Low Last 24h: {low_last_24h}
+- High Today: {high_today}
+- High Last 24h: {high_last_24h}
+- Opening Price: {opening_price}
 
 This data represents a snapshot of market conditions at the time of retrieval and may have changed since then.
         """
 
+@dataclass(slots=True)
+class KrakenTickerData:
+    pair: str
+    ask_price: str
+    ask_whole_lot_volume: str
+    ask_lot_volume: str
+    bid_price: str
+    bid_whole_lot_volume: str
+    bid_lot_volume: str
+    last_trade_price: str
+    last_trade_volume: str
+    volume_today: str
+    volume_last_24h: str
+    volume_weighted_avg_price_today: str
+    volume_weighted_avg_price_last_24h: str
+    number_of_trades_today: str
+    number_of_trades_last_24h: str
+    low_today: str
+    low_last_24h: str
+    high_today: str
+    high_last_24h: str
+    opening_price: str
+    timestamp: float = 0.0
+    source: str = "Kraken API"
+
+    # Rendered output, built on first use and reused for every later request
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _prompt_message: Optional[types.PromptMessage] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _text_content: Optional[types.TextContent] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def to_text(self) -> str:
+        # The rendered text only depends on the instance, so build it once
+        if self._text is None:
+            timestamp_str = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(self.timestamp)) if self.timestamp else "Unknown time"
+            self._text = _TICKER_TEMPLATE.format(
+                pair=self.pair,
+                source=self.source,
+                timestamp=timestamp_str,
+                ask_price=self.ask_price,
+                ask_whole_lot_volume=self.ask_whole_lot_volume,
+                ask_lot_volume=self.ask_lot_volume,
+                bid_price=self.bid_price,
+                bid_whole_lot_volume=self.bid_whole_lot_volume,
+                bid_lot_volume=self.bid_lot_volume,
+                last_trade_price=self.last_trade_price,
+                last_trade_volume=self.last_trade_volume,
+                volume_today=self.volume_today,
+                volume_last_24h=self.volume_last_24h,
+                volume_weighted_avg_price_today=self.volume_weighted_avg_price_today,
+                volume_weighted_avg_price_last_24h=self.volume_weighted_avg_price_last_24h,
+                number_of_trades_today=self.number_of_trades_today,
+                number_of_trades_last_24h=self.number_of_trades_last_24h,
+                low_today=self.low_today,
+                low_last_24h=self.low_last_24h,
+                high_today=self.high_today,
+                high_last_24h=self.high_last_24h,
+                opening_price=self.opening_price,
+            )
+        return self._text
+
     def to_prompt_result(self) -> types.GetPromptResult:
+        if self._prompt_message is None:
+            self._prompt_message = types.PromptMessage(
+                role="user", content=types.TextContent(type="text", text=self.to_text())
+            )
+        # Callers may mutate the result and its messages list, so only the
+        # message model itself is shared
         return types.GetPromptResult(
             description=f"Kraken Ticker Information for {self.pair}",
-            messages=[
-                types.PromptMessage(
-                    role="user", content=types.TextContent(type="text", text=self.to_text())
-                )
-            ],
+            messages=[self._prompt_message],
         )
 
     def to_tool_result(self) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-        return [types.TextContent(type="text", text=self.to_text())]
+        if self._text_content is None:
+            self._text_content = types.TextContent(type="text", text=self.to_text())
+        # Callers may mutate the list, so only the content model itself is shared
+        return [self._text_content]
 
 
 class KrakenError(Exception):
     pass
 
 
-def parse_ticker_data(pair: str, data: Dict[str, Any]) -> KrakenTickerData:
+class KrakenUnavailableError(McpError):
+    """Raised when Kraken can't be reached or answers with a server error."""
+
+
+def _mcp_error(message: str, error_type: type[McpError] = McpError) -> McpError:
+    """Wrap a message in the McpError the MCP server reports back to the client."""
+    return error_type(types.ErrorData(code=types.INTERNAL_ERROR, message=message))
+
+
+# Response key and array index (None for scalars) backing each KrakenTickerData field
+_TICKER_FIELDS = [
+    ("ask_price", "a", 0),
+    ("ask_whole_lot_volume", "a", 1),
+    ("ask_lot_volume", "a", 2),
+    ("bid_price", "b", 0),
+    ("bid_whole_lot_volume", "b", 1),
+    ("bid_lot_volume", "b", 2),
+    ("last_trade_price", "c", 0),
+    ("last_trade_volume", "c", 1),
+    ("volume_today", "v", 0),
+    ("volume_last_24h", "v", 1),
+    ("volume_weighted_avg_price_today", "p", 0),
+    ("volume_weighted_avg_price_last_24h", "p", 1),
+    ("number_of_trades_today", "t", 0),
+    ("number_of_trades_last_24h", "t", 1),
+    ("low_today", "l", 0),
+    ("low_last_24h", "l", 1),
+    ("high_today", "h", 0),
+    ("high_last_24h", "h", 1),
+    ("opening_price", "o", None),
+]
+
+
+def _compile_pair_parser():
+    """
+    Generate a parser for a single pair's ticker data from _TICKER_FIELDS.
+
+    The generated function indexes every field directly, with no loop or
+    nested dict construction, e.g. ``ask_price=pair_data["a"][0]``, and
+    binds KrakenTickerData as a default argument so it is a local lookup.
+    """
+    kwargs = "".join(
+        f"        {attr}=pair_data[{key!r}]{'' if index is None else f'[{index}]'},\n"
+        for attr, key, index in _TICKER_FIELDS
+    )
+    source = (
+        "def _parse_pair_data(pair, pair_data, KrakenTickerData=KrakenTickerData):\n"
+        "    return KrakenTickerData(\n"
+        "        pair=pair,\n"
+        f"{kwargs}"
+        "    )\n"
+    )
+    namespace = {"KrakenTickerData": KrakenTickerData}
+    exec(source, namespace)
+    return namespace["_parse_pair_data"]
+
+
+_parse_pair_data = _compile_pair_parser()
+
+
+def _parse_ticker_entry(
+    pair: str, pair_data: Dict[str, Any], *, _parse_pair_data=_parse_pair_data
+) -> KrakenTickerData:
+    """Parse one pair's entry from the 'result' mapping, raising KrakenError if it is malformed."""
+    try:
+        return _parse_pair_data(pair, pair_data)
+    except (KeyError, IndexError, TypeError) as e:
+        raise KrakenError(f"Error parsing Kraken API response: {str(e)}")
+
+
+def parse_ticker_data(
+    pair: str, data: Dict[str, Any], *, _parse_ticker_entry=_parse_ticker_entry
+) -> KrakenTickerData:
     """
     Parse the Kraken ticker API response into a structured KrakenTickerData object.
     
@@ -93,56 +250,49 @@ def parse_ticker_data(pair: str, data: Dict[str, Any]) -> KrakenTickerData:
     h = high array(<today>, <last 24 hours>)
     o = today's opening price
     """
-    try:
-        pair_data = next(iter(data.values()))
-        
-        return KrakenTickerData(
-            pair=pair,
-            ask={
-                "price": pair_data["a"][0],
-                "whole_lot_volume": pair_data["a"][1],
-                "lot_volume": pair_data["a"][2]
-            },
-            bid={
-                "price": pair_data["b"][0],
-                "whole_lot_volume": pair_data["b"][1],
-                "lot_volume": pair_data["b"][2]
-            },
-            last_trade={
-                "price": pair_data["c"][0],
-                "volume": pair_data["c"][1]
-            },
-            volume={
-                "today": pair_data["v"][0],
-                "last_24h": pair_data["v"][1]
-            },
-            volume_weighted_avg_price={
-                "today": pair_data["p"][0],
-                "last_24h": pair_data["p"][1]
-            },
-            number_of_trades={
-                "today": pair_data["t"][0],
-                "last_24h": pair_data["t"][1]
-            },
-            low={
-                "today": pair_data["l"][0],
-                "last_24h": pair_data["l"][1]
-            },
-            high={
-                "today": pair_data["h"][0],
-                "last_24h": pair_data["h"][1]
-            },
-            opening_price=pair_data["o"]
-        )
-    except (KeyError, IndexError) as e:
-        raise KrakenError(f"Error parsing Kraken API response: {str(e)}")
+    pair_data = next(iter(data.values()), None)
+    if pair_data is None:
+        raise KrakenError("Error parsing Kraken API response: no ticker data in 'result'")
+    return _parse_ticker_entry(pair, pair_data)
+
+
+# Raw pair names mapped to their normalized form, capped so arbitrary input can't grow it forever
+_PAIR_ALIAS: Dict[str, str] = {}
+_PAIR_ALIAS_MAX = 1024
+
+
+def _normalize_pair(pair: str) -> str:
+    """Map a user-supplied pair to the name Kraken expects, memoizing the result."""
+    normalized_pair = _PAIR_ALIAS.get(pair)
+    if normalized_pair is None:
+        # Kraken API uses XBT instead of BTC, handle this common case
+        normalized_pair = sys.intern(pair.replace("BTC", "XBT"))
+        if len(_PAIR_ALIAS) < _PAIR_ALIAS_MAX:
+            _PAIR_ALIAS[sys.intern(pair)] = normalized_pair
+    return normalized_pair
+
+
+# Parsed ticker data keyed by normalized pair, with the monotonic time it was fetched
+_cache: Dict[str, Tuple[float, KrakenTickerData]] = {}
+_inflight: Dict[str, asyncio.Future] = {}
 
 
 async def get_ticker_info(
-    http_client: httpx.AsyncClient, pair: str
+    http_client: httpx.AsyncClient,
+    pair: str,
+    *,
+    # Bound as locals so the cache-hit path avoids global and attribute lookups
+    _normalize_pair=_normalize_pair,
+    _monotonic=time.monotonic,
 ) -> KrakenTickerData:
     """
     Fetch ticker information from the Kraken API for the specified trading pair.
+
+    Results are cached per normalized pair (e.g. "BTCUSD" and "XBTUSD" share
+    an entry labelled "XBTUSD") for KRAKEN_CACHE_TTL seconds, and concurrent
+    calls for the same pair share one request. If Kraken is unavailable
+    during a refresh, an entry up to KRAKEN_CACHE_MAX_STALE seconds old is
+    returned instead, with its source marked as stale.
     
     Args:
         http_client: An initialized httpx AsyncClient
@@ -154,45 +304,223 @@ async def get_ticker_info(
     Raises:
         McpError: If there's an error fetching or parsing the data
     """
-    try:
-        # Kraken API uses XBT instead of BTC, handle this common case
-        normalized_pair = pair.replace("BTC", "XBT")
-        
-        response = await http_client.get(
-            f"Ticker?pair={normalized_pair}"
+    normalized_pair = _normalize_pair(pair)
+
+    cached = _cache.get(normalized_pair)
+    if cached is not None and _monotonic() - cached[0] < KRAKEN_CACHE_TTL:
+        return cached[1]
+
+    # Concurrent misses for the same pair share a single in-flight refresh
+    refresh = _inflight.get(normalized_pair)
+    if refresh is None:
+        refresh = asyncio.ensure_future(
+            _refresh_ticker_info(http_client, normalized_pair, cached)
         )
-        response.raise_for_status()
-        data = response.json()
-        
-        if "error" in data and data["error"]:
-            if data["error"]:
-                raise KrakenError(f"Kraken API error: {data['error'][0]}")
-        
-        if "result" not in data:
-            raise KrakenError("Invalid response from Kraken API: missing 'result' field")
-        
-        # Create ticker data with current timestamp
-        ticker_data = parse_ticker_data(pair, data["result"])
-        ticker_data.timestamp = datetime.utcnow()
-        return ticker_data
-        
+        _inflight[normalized_pair] = refresh
+
+        def _refresh_done(task: asyncio.Future) -> None:
+            _inflight.pop(normalized_pair, None)
+            # Retrieve the outcome here so a failed refresh whose waiters were
+            # all cancelled doesn't log "Task exception was never retrieved"
+            if not task.cancelled():
+                task.exception()
+
+        refresh.add_done_callback(_refresh_done)
+    # Shield the shared refresh so one cancelled caller doesn't cancel it for all
+    return await asyncio.shield(refresh)
+
+
+async def _refresh_ticker_info(
+    http_client: httpx.AsyncClient,
+    normalized_pair: str,
+    cached: Optional[Tuple[float, KrakenTickerData]],
+) -> KrakenTickerData:
+    """
+    Fetch a pair and store it in the cache.
+
+    If Kraken is unreachable or returns a server error, a cached entry no
+    older than KRAKEN_CACHE_MAX_STALE seconds is returned instead, with its
+    source marked as stale. Any other error is raised as is.
+    """
+    try:
+        ticker_data = await _fetch_ticker_info(http_client, normalized_pair)
+    except KrakenUnavailableError:
+        # Serve the last known data rather than failing outright
+        if cached is not None and time.monotonic() - cached[0] <= KRAKEN_CACHE_MAX_STALE:
+            return replace(cached[1], source=f"{cached[1].source} (stale)")
+        raise
+
+    _cache[normalized_pair] = (time.monotonic(), ticker_data)
+    return ticker_data
+
+
+async def get_tickers_info(
+    http_client: httpx.AsyncClient, pairs: List[str]
+) -> List[KrakenTickerData]:
+    """
+    Fetch ticker information for several trading pairs in a single Kraken API request.
+
+    Each result is labelled with the pair name Kraken returns (e.g.
+    "XXBTZUSD"), since the response isn't keyed by the names that were
+    requested. These results bypass the per-pair cache used by
+    get_ticker_info.
+
+    Args:
+        http_client: An initialized httpx AsyncClient
+        pairs: The trading pairs to get information for (e.g., ["BTCUSD", "ETHUSD"])
+
+    Returns:
+        A list of KrakenTickerData objects, one per pair in the response
+
+    Raises:
+        McpError: If there's an error fetching or parsing the data
+    """
+    if not pairs:
+        raise _mcp_error("At least one trading pair is required")
+
+    result = await _fetch_ticker_result(
+        http_client, ",".join(_normalize_pair(pair) for pair in pairs)
+    )
+    timestamp = time.time()
+    tickers = []
+    for name, pair_data in result.items():
+        try:
+            ticker_data = _parse_ticker_entry(name, pair_data)
+        except KrakenError as e:
+            raise _mcp_error(str(e))
+        ticker_data.timestamp = timestamp
+        tickers.append(ticker_data)
+    return tickers
+
+
+async def _fetch_ticker_info(
+    http_client: httpx.AsyncClient, normalized_pair: str
+) -> KrakenTickerData:
+    """
+    Fetch and parse ticker information for a pair, bypassing the cache.
+
+    The result is labelled with the normalized pair, since it is cached and
+    shared by every caller whose input normalizes to the same name.
+    """
+    result = await _fetch_ticker_result(http_client, normalized_pair)
+
+    # Create ticker data with current timestamp
+    try:
+        ticker_data = parse_ticker_data(normalized_pair, result)
     except KrakenError as e:
-        raise McpError(str(e))
-    except httpx.HTTPStatusError as e:
-        raise McpError(f"Error fetching Kraken ticker info: {str(e)}")
-    except Exception as e:
-        raise McpError(f"An error occurred: {str(e)}")
+        raise _mcp_error(str(e))
+    ticker_data.timestamp = time.time()
+    return ticker_data
+
+
+async def _fetch_ticker_result(
+    http_client: httpx.AsyncClient, pair_param: str
+) -> Dict[str, Any]:
+    """Request the Ticker endpoint and return its 'result' mapping of pair name to data."""
+    request = http_client.build_request(
+        "GET", _TICKER_URL, params={"pair": pair_param}
+    )
+    try:
+        response = await http_client.send(request)
+    except httpx.HTTPError as e:
+        raise _mcp_error(f"Error fetching Kraken ticker info: {str(e)}", KrakenUnavailableError)
+    if not response.is_success:
+        raise _mcp_error(
+            f"Error fetching Kraken ticker info: HTTP {response.status_code} {response.reason_phrase}",
+            KrakenUnavailableError if response.is_server_error else McpError,
+        )
+
+    try:
+        data = orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise _mcp_error(f"Invalid response from Kraken API: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise _mcp_error("Invalid response from Kraken API: expected a JSON object")
+    if data.get("error"):
+        raise _mcp_error(f"Kraken API error: {data['error'][0]}")
+    if not isinstance(data.get("result"), dict):
+        raise _mcp_error("Invalid response from Kraken API: missing or invalid 'result' field")
+    return data["result"]
+
+
+class KrakenMCP(FastMCP):
+    """
+    FastMCP server that builds its tool and prompt listings once.
+
+    The registered tools and prompts never change after import, so the
+    protocol objects are cached on first listing and only rebuilt if a
+    tool or prompt is added or removed.
+    """
+
+    _tools: Optional[List[types.Tool]] = None
+    _prompts: Optional[List[types.Prompt]] = None
+
+    def add_tool(self, *args: Any, **kwargs: Any) -> None:
+        super().add_tool(*args, **kwargs)
+        self._tools = None
+
+    def remove_tool(self, name: str) -> None:
+        super().remove_tool(name)
+        self._tools = None
+
+    def add_prompt(self, *args: Any, **kwargs: Any) -> None:
+        super().add_prompt(*args, **kwargs)
+        self._prompts = None
+
+    async def list_tools(self) -> List[types.Tool]:
+        if self._tools is None:
+            self._tools = await super().list_tools()
+        # Hand out a fresh list in case the caller mutates it
+        return list(self._tools)
+
+    async def list_prompts(self) -> List[types.Prompt]:
+        if self._prompts is None:
+            self._prompts = await super().list_prompts()
+        return list(self._prompts)
 
 
 # Create a FastMCP server with customizable settings
-mcp = FastMCP(
+mcp = KrakenMCP(
     name="kraken",
     # We'll set stateless_http in the main function based on CLI args
     stateless_http=False
 )
 
-# We'll create and manage the HTTP client directly
-http_client = httpx.AsyncClient(base_url=KRAKEN_API_BASE)
+def _create_http_client() -> httpx.AsyncClient:
+    """
+    Create the HTTP client used for Kraken API calls.
+
+    HTTP/2 and a generous keep-alive pool let repeated ticker calls reuse
+    one TLS connection. Responses are requested gzip or brotli compressed;
+    httpx decompresses them transparently.
+    """
+    return httpx.AsyncClient(
+        base_url=KRAKEN_API_BASE,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0
+        ),
+        timeout=httpx.Timeout(connect=5.0, read=10.0, write=5.0, pool=5.0),
+        headers={
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, br",
+            "User-Agent": "kraken-mcp/0.1",
+        },
+    )
+
+
+# Shared by every session so they all draw from one connection pool
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared Kraken HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+    return _http_client
+
 
 # Register the get_ticker prompt
 @mcp.prompt(
@@ -200,7 +528,7 @@ http_client = httpx.AsyncClient(base_url=KRAKEN_API_BASE)
     description="Get ticker information for a trading pair from Kraken"
 )
 async def kraken_ticker_prompt(pair: str):
-    ticker_data = await get_ticker_info(http_client, pair)
+    ticker_data = await get_ticker_info(get_client(), pair)
     return ticker_data.to_prompt_result()
 
 # Register the get_ticker tool
@@ -217,10 +545,37 @@ async def get_ticker(pair: str) -> list[types.TextContent | types.ImageContent |
     Returns:
         Detailed ticker information
     """
-    ticker_data = await get_ticker_info(http_client, pair)
+    ticker_data = await get_ticker_info(get_client(), pair)
     return ticker_data.to_tool_result()
 
 
+# Register the get_tickers tool
+@mcp.tool(
+    description="Get ticker information for several trading pairs from Kraken in one request"
+)
+async def get_tickers(pairs: list[str]) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """
+    Fetch ticker information from the Kraken API for several trading pairs at once.
+    
+    Args:
+        pairs: The trading pairs to get information for (e.g., ["BTCUSD", "ETHUSD"])
+    
+    Returns:
+        Detailed ticker information for each pair
+    """
+    tickers = await get_tickers_info(get_client(), pairs)
+    return [content for ticker_data in tickers for content in ticker_data.to_tool_result()]
+
+
+async def run_server(transport: str) -> None:
+    """Run the MCP server on the given transport, closing the HTTP client on exit."""
+    async with get_client():
+        if transport == "streamable-http":
+            await mcp.run_streamable_http_async()
+        else:
+            await mcp.run_stdio_async()
+
+
 @click.command()
 @click.option("--transport", default="streamable-http", 
               type=click.Choice(["stdio", "streamable-http"]), 
@@ -237,22 +592,20 @@ def main(transport, host, port, stateless):
     # Handle different transports
     if transport == "streamable-http":
         # Set host and port via environment variables
-        import os
         os.environ["MCP_HOST"] = host
         os.environ["MCP_PORT"] = str(port)
         
-        print(f"Starting Kraken MCP server with streamable HTTP transport")
-        print(f"Server will be available at http://{host}:{port}/mcp")
-        print(f"Connect your MCP Inspector to http://{host}:{port}/mcp")
+        print("Starting Kraken MCP server with streamable HTTP transport", file=sys.stderr)
+        print(f"Server will be available at http://{host}:{port}/mcp", file=sys.stderr)
+        print(f"Connect your MCP Inspector to http://{host}:{port}/mcp", file=sys.stderr)
     else:  # stdio
-        print("Starting Kraken MCP server with stdio transport")
-        print("Connect to this server using the MCP Inspector or Claude Desktop")
+        # stdout carries the MCP protocol stream, so diagnostics must go to stderr
+        print("Starting Kraken MCP server with stdio transport", file=sys.stderr)
+        print("Connect to this server using the MCP Inspector or Claude Desktop", file=sys.stderr)
     
-    # Run with the specified transport and mount path for streamable-http
-    if transport == "streamable-http":
-        mcp.run(transport=transport, mount_path="/mcp")
-    else:
-        mcp.run(transport=transport)
+    # Prefer uvloop's faster event loop when it's installed
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(run_server(transport))
 
 
 if __name__ == "__main__":
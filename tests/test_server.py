@@ -0,0 +1,382 @@
+import asyncio
+import dataclasses
+import gc
+
+import httpx
+import pytest
+from mcp.shared.exceptions import McpError
+
+from mcp_server_kraken import server
+
+PAIR_DATA = {
+    "a": ["101.0", "1", "1.000"],
+    "b": ["100.0", "2", "2.000"],
+    "c": ["100.5", "0.1"],
+    "v": ["10", "20"],
+    "p": ["100.2", "100.3"],
+    "t": [5, 9],
+    "l": ["99.0", "98.0"],
+    "h": ["102.0", "103.0"],
+    "o": "100.1",
+}
+
+# Names Kraken uses as keys in its response for the pairs these tests request
+KRAKEN_NAMES = {"XBTUSD": "XXBTZUSD", "ETHUSD": "XETHZUSD"}
+
+
+class FakeKraken:
+    """Mock Ticker endpoint that records each request and can be switched to fail."""
+
+    def __init__(self):
+        self.requests = []
+        self.status_code = 200
+        self.error_body = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        # Yield so concurrent callers get a chance to pile up on the same request
+        await asyncio.sleep(0.01)
+        if self.error_body is not None:
+            return httpx.Response(self.status_code, json=self.error_body)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code)
+        pairs = request.url.params["pair"].split(",")
+        result = {KRAKEN_NAMES.get(pair, pair): PAIR_DATA for pair in pairs}
+        return httpx.Response(200, json={"error": [], "result": result})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=server.KRAKEN_API_BASE, transport=httpx.MockTransport(self)
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_cache(monkeypatch):
+    server._cache.clear()
+    server._inflight.clear()
+    monkeypatch.setattr(server, "KRAKEN_CACHE_TTL", 60.0)
+    monkeypatch.setattr(server, "KRAKEN_CACHE_MAX_STALE", 60.0)
+    yield
+    server._cache.clear()
+    server._inflight.clear()
+
+
+@pytest.fixture
+def kraken():
+    return FakeKraken()
+
+
+def test_concurrent_misses_share_one_request(kraken):
+    async def fetch_many():
+        async with kraken.client() as client:
+            return await asyncio.gather(
+                *(server.get_ticker_info(client, "BTCUSD") for _ in range(10))
+            )
+
+    results = asyncio.run(fetch_many())
+
+    assert len(kraken.requests) == 1
+    assert kraken.requests[0].url.params["pair"] == "XBTUSD"
+    assert all(ticker is results[0] for ticker in results)
+
+
+def test_cancelled_waiter_does_not_leak_refresh_exception(kraken):
+    kraken.status_code = 500
+
+    async def run():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        async with kraken.client() as client:
+            waiter = asyncio.ensure_future(server.get_ticker_info(client, "ETHUSD"))
+            await asyncio.sleep(0)
+            refresh = server._inflight["ETHUSD"]
+            waiter.cancel()
+            await asyncio.wait([refresh])
+            # Let the done callbacks run, then drop the last reference to the task
+            await asyncio.sleep(0)
+            assert "ETHUSD" not in server._inflight
+            del refresh
+            gc.collect()
+        return errors
+
+    assert asyncio.run(run()) == []
+
+
+def test_cache_is_shared_by_pair_aliases(kraken):
+    async def fetch_both():
+        async with kraken.client() as client:
+            first = await server.get_ticker_info(client, "BTCUSD")
+            second = await server.get_ticker_info(client, "XBTUSD")
+            return first, second
+
+    first, second = asyncio.run(fetch_both())
+
+    assert len(kraken.requests) == 1
+    assert first.pair == second.pair == "XBTUSD"
+    assert "Kraken Ticker Information for XBTUSD" in second.to_text()
+
+
+def test_cache_expires_after_ttl(kraken, monkeypatch):
+    async def fetch(client):
+        return await server.get_ticker_info(client, "ETHUSD")
+
+    async def run():
+        async with kraken.client() as client:
+            await fetch(client)
+            await fetch(client)
+            assert len(kraken.requests) == 1
+
+            monkeypatch.setattr(server, "KRAKEN_CACHE_TTL", 0.0)
+            await fetch(client)
+            assert len(kraken.requests) == 2
+
+    asyncio.run(run())
+
+
+def fetch_then_fail(kraken, status_code, body=None):
+    """Fetch ETHUSD once, then fetch it again while Kraken answers with an error."""
+
+    async def run():
+        async with kraken.client() as client:
+            fresh = await server.get_ticker_info(client, "ETHUSD")
+            kraken.status_code = status_code
+            kraken.error_body = body
+            return fresh, await server.get_ticker_info(client, "ETHUSD")
+
+    return asyncio.run(run())
+
+
+def test_stale_entry_served_when_kraken_is_down(kraken, monkeypatch):
+    monkeypatch.setattr(server, "KRAKEN_CACHE_TTL", 0.0)
+
+    fresh, stale = fetch_then_fail(kraken, 500)
+
+    assert len(kraken.requests) == 2
+    assert fresh.source == "Kraken API"
+    assert stale.source == "Kraken API (stale)"
+    assert stale.pair == "ETHUSD"
+    assert stale.ask_price == fresh.ask_price
+    assert "Kraken API (stale)" in stale.to_text()
+
+
+def test_stale_entry_served_on_transport_error(monkeypatch):
+    monkeypatch.setattr(server, "KRAKEN_CACHE_TTL", 0.0)
+    fail = False
+
+    def handler(request):
+        if fail:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"error": [], "result": {"XETHZUSD": PAIR_DATA}})
+
+    async def run():
+        nonlocal fail
+        async with httpx.AsyncClient(
+            base_url=server.KRAKEN_API_BASE, transport=httpx.MockTransport(handler)
+        ) as client:
+            await server.get_ticker_info(client, "ETHUSD")
+            fail = True
+            return await server.get_ticker_info(client, "ETHUSD")
+
+    assert asyncio.run(run()).source == "Kraken API (stale)"
+
+
+def test_stale_entry_not_served_past_max_staleness(kraken, monkeypatch):
+    monkeypatch.setattr(server, "KRAKEN_CACHE_TTL", 0.0)
+    monkeypatch.setattr(server, "KRAKEN_CACHE_MAX_STALE", 0.0)
+
+    with pytest.raises(McpError, match="HTTP 500"):
+        fetch_then_fail(kraken, 500)
+
+
+@pytest.mark.parametrize(
+    "status_code, body",
+    [(404, None), (200, {"error": ["EQuery:Unknown asset pair"]})],
+)
+def test_stale_entry_not_served_for_client_or_api_errors(kraken, monkeypatch, status_code, body):
+    monkeypatch.setattr(server, "KRAKEN_CACHE_TTL", 0.0)
+
+    with pytest.raises(McpError):
+        fetch_then_fail(kraken, status_code, body)
+
+
+def test_refresh_failure_without_cache_raises(kraken):
+    kraken.status_code = 500
+
+    async def run():
+        async with kraken.client() as client:
+            await server.get_ticker_info(client, "ETHUSD")
+
+    with pytest.raises(McpError, match="HTTP 500"):
+        asyncio.run(run())
+
+
+@pytest.mark.parametrize("value, expected", [("5", 5.0), ("0.5", 0.5), ("0", 0.0)])
+def test_env_seconds_reads_valid_values(monkeypatch, value, expected):
+    monkeypatch.setenv("KRAKEN_TEST_SECONDS", value)
+
+    assert server._env_seconds("KRAKEN_TEST_SECONDS", 3.0) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "-1", "nan", ""])
+def test_env_seconds_falls_back_on_invalid_values(monkeypatch, capsys, value):
+    monkeypatch.setenv("KRAKEN_TEST_SECONDS", value)
+
+    assert server._env_seconds("KRAKEN_TEST_SECONDS", 3.0) == 3.0
+    assert "Ignoring invalid KRAKEN_TEST_SECONDS" in capsys.readouterr().err
+
+
+def test_env_seconds_uses_default_when_unset(monkeypatch):
+    monkeypatch.delenv("KRAKEN_TEST_SECONDS", raising=False)
+
+    assert server._env_seconds("KRAKEN_TEST_SECONDS", 3.0) == 3.0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"error": [], "result": {}}',
+        b"[]",
+        b'{"error": [], "result": {"XETHZUSD": 1}}',
+        b'{"error": ["EQuery:Unknown asset pair"]}',
+    ],
+)
+def test_malformed_responses_raise_mcp_error(body):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+    async def run():
+        async with httpx.AsyncClient(
+            base_url=server.KRAKEN_API_BASE, transport=transport
+        ) as client:
+            await server.get_ticker_info(client, "ETHUSD")
+
+    with pytest.raises(McpError):
+        asyncio.run(run())
+
+
+def test_get_tickers_single_pair_uses_kraken_name(kraken):
+    async def run():
+        async with kraken.client() as client:
+            return await server.get_tickers_info(client, ["BTCUSD"])
+
+    tickers = asyncio.run(run())
+
+    assert len(kraken.requests) == 1
+    assert [ticker.pair for ticker in tickers] == ["XXBTZUSD"]
+
+
+def test_get_tickers_several_pairs_in_one_request(kraken):
+    async def run():
+        async with kraken.client() as client:
+            return await server.get_tickers_info(client, ["BTCUSD", "ETHUSD"])
+
+    tickers = asyncio.run(run())
+
+    assert len(kraken.requests) == 1
+    assert kraken.requests[0].url.params["pair"] == "XBTUSD,ETHUSD"
+    assert [ticker.pair for ticker in tickers] == ["XXBTZUSD", "XETHZUSD"]
+    assert tickers[0].timestamp == tickers[1].timestamp
+
+
+def test_get_tickers_requires_a_pair(kraken):
+    async def run():
+        async with kraken.client() as client:
+            await server.get_tickers_info(client, [])
+
+    with pytest.raises(McpError):
+        asyncio.run(run())
+    assert kraken.requests == []
+
+
+def test_tool_listing_is_cached_until_tools_change():
+    app = server.KrakenMCP(name="test")
+
+    @app.tool()
+    def first() -> str:
+        return "first"
+
+    async def list_names():
+        return [tool.name for tool in await app.list_tools()]
+
+    assert asyncio.run(list_names()) == ["first"]
+    listed = asyncio.run(app.list_tools())
+    listed.clear()
+    assert asyncio.run(list_names()) == ["first"]
+
+    @app.tool()
+    def second() -> str:
+        return "second"
+
+    assert asyncio.run(list_names()) == ["first", "second"]
+
+    app.remove_tool("first")
+    assert asyncio.run(list_names()) == ["second"]
+
+
+def test_prompt_listing_is_cached_until_prompts_change():
+    app = server.KrakenMCP(name="test")
+
+    @app.prompt()
+    def first() -> str:
+        return "first"
+
+    async def list_names():
+        return [prompt.name for prompt in await app.list_prompts()]
+
+    assert asyncio.run(list_names()) == ["first"]
+
+    @app.prompt()
+    def second() -> str:
+        return "second"
+
+    assert asyncio.run(list_names()) == ["first", "second"]
+
+
+def test_generated_parser_matches_field_table():
+    # Give every array slot a distinct value so a wrong key or index shows up
+    pair_data = {
+        key: [f"{key}{index}" for index in range(3)] for key in "abcvptlh"
+    }
+    pair_data["o"] = "o"
+
+    ticker = server._parse_pair_data("XETHZUSD", pair_data)
+
+    assert ticker.pair == "XETHZUSD"
+    for attr, key, index in server._TICKER_FIELDS:
+        expected = pair_data[key] if index is None else pair_data[key][index]
+        assert getattr(ticker, attr) == expected, attr
+
+    required = {
+        field.name
+        for field in dataclasses.fields(server.KrakenTickerData)
+        if field.init and field.default is dataclasses.MISSING
+    }
+    assert required == {"pair"} | {attr for attr, _, _ in server._TICKER_FIELDS}
+
+
+def test_prompt_result_is_fresh_but_shares_message():
+    ticker = server._parse_pair_data("XETHZUSD", PAIR_DATA)
+
+    first = ticker.to_prompt_result()
+    second = ticker.to_prompt_result()
+
+    assert first is not second
+    assert first.messages is not second.messages
+    assert first.messages[0] is second.messages[0]
+    assert first.messages[0].content.text == ticker.to_text()
+    assert first.description == "Kraken Ticker Information for XETHZUSD"
+
+
+def test_tool_result_is_fresh_list_with_shared_content():
+    ticker = server._parse_pair_data("XETHZUSD", PAIR_DATA)
+
+    first = ticker.to_tool_result()
+    first.clear()
+    second = ticker.to_tool_result()
+    third = ticker.to_tool_result()
+
+    assert second is not third
+    assert len(second) == 1
+    assert second[0] is third[0]
+    assert second[0].text == ticker.to_text()